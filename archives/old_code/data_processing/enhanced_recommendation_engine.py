@@ -40,8 +40,13 @@ class EnhancedRecommendationEngine:
         logger.info(f"Enhanced Recommendation Engine initialized with database: {self.db_path}")
 
     def _get_connection(self):
-        """Get a thread-safe database connection"""
-        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        """Get a thread-safe, read-only database connection"""
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False
+        )
+        conn.execute("PRAGMA mmap_size=268435456")  # Serve pages from the OS page cache
         conn.row_factory = sqlite3.Row  # Enable column access by name
         return conn
 
@@ -465,7 +470,8 @@ class EnhancedRecommendationEngine:
     def generate_quote_ready_export(
         self,
         customer_id: Optional[str] = None,
-        urgency_filter: Optional[List[str]] = None
+        urgency_filter: Optional[List[str]] = None,
+        min_confidence: Optional[float] = None
     ) -> pd.DataFrame:
         """
         Generate quote-ready export with SKU codes
@@ -473,10 +479,34 @@ class EnhancedRecommendationEngine:
         Args:
             customer_id: Optional customer filter
             urgency_filter: Optional urgency levels (Critical, High, Medium, Low)
+            min_confidence: Optional minimum product match confidence
 
         Returns:
             DataFrame ready for quote generation
         """
+        query, params = self._quote_ready_query(customer_id, urgency_filter, min_confidence)
+        query += " ORDER BY urgency DESC, s.priority, c.customer_name"
+
+        conn = self._get_connection()
+        df = pd.read_sql(query, conn, params=params)
+        conn.close()
+
+        # Add quote preparation fields
+        df['quote_ready'] = df['sku_codes'].notna() & (df['sku_codes'] != '')
+        df['action_required'] = np.where(
+            df['urgency'].to_numpy() == 'Critical', 'Immediate', 'Standard'
+        )
+
+        return df
+
+    def _quote_ready_query(
+        self,
+        customer_id: Optional[str] = None,
+        urgency_filter: Optional[List[str]] = None,
+        min_confidence: Optional[float] = None
+    ) -> Tuple[str, List]:
+        """Build the grouped quote-ready recommendation query and its parameters"""
+        params = []
         query = """
         SELECT
             c.customer_name,
@@ -514,6 +544,10 @@ class EnhancedRecommendationEngine:
         if customer_id:
             query += f" AND c.customer_id_5digit = '{customer_id}'"
 
+        if min_confidence is not None:
+            query += " AND m.confidence_score >= ?"
+            params.append(min_confidence)
+
         query += """
         GROUP BY c.customer_key, p.product_key, s.ls_service_key
         """
@@ -521,20 +555,7 @@ class EnhancedRecommendationEngine:
         if urgency_filter:
             query += " HAVING urgency IN ('" + "','".join(urgency_filter) + "')"
 
-        query += " ORDER BY urgency DESC, s.priority, c.customer_name"
-
-        conn = self._get_connection()
-        df = pd.read_sql(query, conn)
-        conn.close()
-
-        # Add quote preparation fields
-        df['quote_ready'] = df['sku_codes'].notna() & (df['sku_codes'] != '')
-        df['action_required'] = df.apply(
-            lambda x: 'Immediate' if x['urgency'] == 'Critical' else 'Standard',
-            axis=1
-        )
-
-        return df
+        return query, params
 
     def get_recommendation_summary(self, customer_id: str) -> Dict:
         """
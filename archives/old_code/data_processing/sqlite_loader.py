@@ -4,6 +4,7 @@ Replaces Excel file loading with SQLite database queries
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 from pathlib import Path
 import logging
@@ -27,16 +28,33 @@ class OneleadSQLiteLoader:
         self.db_path = Path(db_path)
         if not self.db_path.exists():
             raise FileNotFoundError(f"Database not found: {self.db_path}")
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a read-only, memory-mapped connection to the database"""
+        conn = sqlite3.connect(f"{self.db_path.resolve().as_uri()}?mode=ro", uri=True)
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
         
-    @st.cache_data(ttl=3600)  # Cache for 1 hour
-    def load_all_data(_self) -> Dict[str, pd.DataFrame]:
+    def load_all_data(self) -> Dict[str, pd.DataFrame]:
         """
         Load all data from SQLite database
         
+        The cached result is keyed on the database file's path, mtime and
+        size, so rebuilding the database invalidates it immediately.
+        
         Returns:
             Dictionary of DataFrames
         """
-        conn = sqlite3.connect(_self.db_path)
+        stat = self.db_path.stat()
+        return self._load_all_data(str(self.db_path.resolve()), stat.st_mtime_ns, stat.st_size)
+    
+    @st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+    def _load_all_data(_self, db_path: str, mtime_ns: int, size: int) -> Dict[str, pd.DataFrame]:
+        """Query every dashboard table; arguments only serve as the cache key"""
+        conn = _self._connect()
         
         try:
             data = {}
@@ -149,41 +167,40 @@ class OneleadSQLiteLoader:
             return pd.DataFrame()
         
         # Create simulated product data
-        import numpy as np
         from datetime import datetime, timedelta
         
-        products = []
-        product_types = [
-            ('HP DL360p Gen8', 'Server', 'x86 Premium Servers', '2019-12-31'),
-            ('HP MSA2000', 'Storage', 'Storage Arrays', '2018-06-30'),
-            ('Aruba AP-325', 'Network', 'WLAN Infrastructure', '2099-12-31'),
-            ('HP BL460c', 'Server', 'Blade Servers', '2020-03-31'),
-            ('HP 3PAR', 'Storage', 'Enterprise Storage', '2021-12-31'),
-        ]
+        product_types = pd.DataFrame(
+            [
+                ('HP DL360p Gen8', 'Server', 'x86 Premium Servers', '2019-12-31'),
+                ('HP MSA2000', 'Storage', 'Storage Arrays', '2018-06-30'),
+                ('Aruba AP-325', 'Network', 'WLAN Infrastructure', '2099-12-31'),
+                ('HP BL460c', 'Server', 'Blade Servers', '2020-03-31'),
+                ('HP 3PAR', 'Storage', 'Enterprise Storage', '2021-12-31'),
+            ],
+            columns=['product_description', 'product_platform', 'product_business', 'eol_date']
+        )
+        product_types['eol_date'] = pd.to_datetime(product_types['eol_date'])
+        
+        # Each customer gets 2-5 random products, drawn for all customers at once
+        num_products = np.random.randint(2, 6, size=len(customers))
+        total = int(num_products.sum())
+        product_idx = np.random.randint(0, len(product_types), size=total)
         
-        for _, customer in customers.iterrows():
-            # Each customer gets 2-5 random products
-            num_products = np.random.randint(2, 6)
-            for _ in range(num_products):
-                product_idx = np.random.randint(0, len(product_types))
-                product = product_types[product_idx]
-                eol_date = pd.to_datetime(product[3])
-                days_to_eol = (eol_date - pd.Timestamp.now()).days
-                
-                products.append({
-                    'account_sales_territory_id': customer['customer_id_5digit'],
-                    'product_serial_number': f"SN{np.random.randint(100000, 999999)}",
-                    'product_description': product[0],
-                    'product_platform': product[1],
-                    'product_business': product[2],
-                    'support_status': 'Active' if days_to_eol > 0 else 'Expired',
-                    'days_to_eol': days_to_eol,
-                    'days_to_eos': days_to_eol + 365,
-                    'eol_date': eol_date,
-                    'eos_date': eol_date + timedelta(days=365)
-                })
+        products = product_types.iloc[product_idx].reset_index(drop=True)
+        days_to_eol = (products['eol_date'] - pd.Timestamp.now()).dt.days
         
-        return pd.DataFrame(products)
+        return pd.DataFrame({
+            'account_sales_territory_id': np.repeat(customers['customer_id_5digit'].to_numpy(), num_products),
+            'product_serial_number': np.char.add('SN', np.random.randint(100000, 999999, size=total).astype(str)),
+            'product_description': products['product_description'],
+            'product_platform': products['product_platform'],
+            'product_business': products['product_business'],
+            'support_status': np.where(days_to_eol > 0, 'Active', 'Expired'),
+            'days_to_eol': days_to_eol,
+            'days_to_eos': days_to_eol + 365,
+            'eol_date': products['eol_date'],
+            'eos_date': products['eol_date'] + timedelta(days=365)
+        })
     
     @st.cache_data(ttl=3600)
     def calculate_metrics(_self, data: Dict[str, pd.DataFrame]) -> Dict:
@@ -202,13 +219,17 @@ class OneleadSQLiteLoader:
         if 'install_base' in data and not data['install_base'].empty:
             ib = data['install_base']
             
-            # Products at risk
-            expired = ib[ib['days_to_eol'] < 0] if 'days_to_eol' in ib.columns else pd.DataFrame()
-            at_risk = ib[(ib['days_to_eol'] >= 0) & (ib['days_to_eol'] < 180)] if 'days_to_eol' in ib.columns else pd.DataFrame()
+            # Products at risk, counted from boolean masks over one days array
+            if 'days_to_eol' in ib.columns:
+                days = ib['days_to_eol'].to_numpy(dtype=float, na_value=np.nan)
+                expired = days < 0
+                at_risk = (days >= 0) & (days < 180)
+            else:
+                expired = at_risk = np.zeros(len(ib), dtype=bool)
             
-            metrics['expired_products'] = len(expired)
-            metrics['products_6mo_risk'] = len(at_risk)
-            metrics['customers_with_expired'] = expired['account_sales_territory_id'].nunique() if not expired.empty else 0
+            metrics['expired_products'] = int(expired.sum())
+            metrics['products_6mo_risk'] = int(at_risk.sum())
+            metrics['customers_with_expired'] = ib.loc[expired, 'account_sales_territory_id'].nunique() if expired.any() else 0
             
             # Support coverage
             if 'support_status' in ib.columns:
@@ -232,13 +253,13 @@ class OneleadSQLiteLoader:
         if 'opportunities' in data:
             metrics['total_opportunities'] = len(data['opportunities'])
             
-            # Get key account (most opportunities)
-            if not data['opportunities'].empty:
-                key_account = data['opportunities'].groupby('account_st_id').size().idxmax()
-                metrics['key_account'] = key_account
-                metrics['key_account_opps'] = data['opportunities'][
-                    data['opportunities']['account_st_id'] == key_account
-                ].shape[0]
+            # Get key account (most opportunities) from one counting pass
+            accounts = data['opportunities']['account_st_id'].dropna().to_numpy()
+            if accounts.size:
+                account_ids, account_opps = np.unique(accounts, return_counts=True)
+                top = account_opps.argmax()
+                metrics['key_account'] = account_ids[top]
+                metrics['key_account_opps'] = int(account_opps[top])
         else:
             metrics['total_opportunities'] = 0
         
@@ -276,7 +297,7 @@ class OneleadSQLiteLoader:
         Returns:
             Query results as DataFrame
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             return pd.read_sql_query(query, conn)
         finally:
@@ -284,7 +305,7 @@ class OneleadSQLiteLoader:
     
     def get_table_info(self) -> pd.DataFrame:
         """Get information about all tables in the database"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         try:
             return pd.read_sql_query("""
                 SELECT 
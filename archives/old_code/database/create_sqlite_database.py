@@ -13,6 +13,8 @@ from datetime import datetime
 import logging
 from typing import Dict, Optional, List, Tuple
 import hashlib
+import json
+from importlib.util import find_spec
 
 # Configure logging
 logging.basicConfig(
@@ -21,6 +23,10 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+PARQUET_AVAILABLE = find_spec('pyarrow') is not None
+if PARQUET_AVAILABLE:
+    import pyarrow as pa
+
 
 class OneleadSQLiteDatabase:
     """Create and manage SQLite database for OneLead system"""
@@ -94,12 +100,17 @@ class OneleadSQLiteDatabase:
                 self.conn.close()
     
     def _load_excel_data(self):
-        """Load data from Excel file"""
+        """Load data from Excel file, reusing the Parquet cache when it is current"""
         logger.info("\n📊 Step 1: Loading Excel data...")
         
         if not self.excel_path.exists():
             raise FileNotFoundError(f"Excel file not found: {self.excel_path}")
         
+        stat = self.excel_path.stat()
+        source = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
+        if self._load_parquet_cache(source):
+            return
+        
         excel_file = pd.ExcelFile(self.excel_path)
         
         # Map sheet names to internal keys
@@ -122,21 +133,92 @@ class OneleadSQLiteDatabase:
             key = sheet_mapping.get(sheet_name, sheet_name.lower().replace(' ', '_'))
             self.data[key] = df
             logger.info(f"    ✓ Loaded {len(df):,} records")
+        
+        self._write_parquet_cache(source)
+    
+    @property
+    def _parquet_cache_dir(self) -> Path:
+        """Directory holding one Parquet file per sheet of the Excel source"""
+        return self.excel_path.with_name(f".{self.excel_path.stem}_parquet")
+    
+    def _load_parquet_cache(self, source: Dict) -> bool:
+        """Load every sheet from the Parquet cache if it was built from this Excel file"""
+        manifest_path = self._parquet_cache_dir / "manifest.json"
+        if not PARQUET_AVAILABLE or not manifest_path.exists():
+            return False
+        
+        try:
+            manifest = json.loads(manifest_path.read_text())
+            if manifest.get('source') != source:
+                logger.info("  Parquet cache is stale, re-reading Excel")
+                return False
+            
+            cached = {
+                key: pd.read_parquet(self._parquet_cache_dir / f"{key}.parquet", engine='pyarrow')
+                for key in manifest['sheets']
+            }
+        except Exception as e:
+            logger.warning(f"  Could not read Parquet cache, re-reading Excel: {e}")
+            return False
+        
+        for key, df in cached.items():
+            self.data[key] = df
+            logger.info(f"  ✓ {key}: {len(df):,} records (Parquet cache)")
+        return True
+    
+    @staticmethod
+    def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+        """Stringify object columns Arrow rejects (e.g. Excel cells mixing dates and text)"""
+        mixed = []
+        for col in df.columns[df.dtypes == object]:
+            try:
+                pa.array(df[col])
+            except (pa.ArrowException, TypeError, ValueError):
+                mixed.append(col)
+        if not mixed:
+            return df
+        return df.assign(**{col: df[col].where(df[col].isna(), df[col].astype(str)) for col in mixed})
+    
+    def _write_parquet_cache(self, source: Dict):
+        """Persist the loaded sheets as Parquet so the next build skips Excel parsing"""
+        if not PARQUET_AVAILABLE:
+            return
+        
+        cache_dir = self._parquet_cache_dir
+        try:
+            cache_dir.mkdir(exist_ok=True)
+            (cache_dir / "manifest.json").unlink(missing_ok=True)
+            for key, df in self.data.items():
+                self._arrow_safe(df).to_parquet(
+                    cache_dir / f"{key}.parquet", engine='pyarrow', compression='zstd'
+                )
+            # The manifest is removed first and written last, so a partial write is never used
+            manifest = {'source': source, 'sheets': list(self.data)}
+            (cache_dir / "manifest.json").write_text(json.dumps(manifest))
+            logger.info(f"  Cached {len(self.data)} sheets as Parquet in {cache_dir}")
+        except Exception as e:
+            logger.warning(f"  Could not write Parquet cache: {e}")
     
     def _create_connection(self):
         """Create SQLite database connection"""
         logger.info(f"\n💾 Step 2: Creating database: {self.db_path}")
         
-        # Remove existing database if it exists
+        # Remove existing database if it exists, with any journal files left beside it
         if self.db_path.exists():
             self.db_path.unlink()
             logger.info("  Removed existing database")
+        for suffix in ('-wal', '-shm', '-journal'):
+            Path(f"{self.db_path}{suffix}").unlink(missing_ok=True)
         
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
         
         # Enable foreign keys
         self.cursor.execute("PRAGMA foreign_keys = ON")
+
+        # The file is rebuilt from scratch, so skip fsyncs during the bulk load;
+        # the default rollback journal keeps the finished file self-contained
+        self.cursor.execute("PRAGMA synchronous = OFF")
         logger.info("  ✓ Database connection established")
     
     def _create_schema(self):
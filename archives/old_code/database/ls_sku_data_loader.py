@@ -107,6 +107,10 @@ class LSSKUDataLoader:
 
             # Commit changes
             self.conn.commit()
+
+            # Refresh planner statistics so the map_install_base_to_ls_sku
+            # indexes are used for the dashboard's joins and ORDER BY
+            self.cursor.execute("ANALYZE")
             logger.info("\n✅ All data loaded successfully!")
 
             return {
@@ -135,6 +139,9 @@ class LSSKUDataLoader:
         self.conn = sqlite3.connect(self.db_path)
         self.cursor = self.conn.cursor()
         self.cursor.execute("PRAGMA foreign_keys = ON")
+        # Keep the rollback journal so read-only dashboard connections never need
+        # -wal/-shm files; this also reverts databases built in WAL mode
+        self.cursor.execute("PRAGMA journal_mode = DELETE")
         logger.info(f"📁 Connected to database: {self.db_path}")
 
     def _apply_schema_enhancements(self):
@@ -5,10 +5,8 @@ Clean, intuitive UI for service recommendations and opportunity management
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 from datetime import datetime
-import sqlite3
 
 # Import data loaders
 from data_processing.sqlite_loader import OneleadSQLiteLoader
@@ -23,7 +21,7 @@ st.set_page_config(
 )
 
 # Clean, modern CSS
-st.markdown("""
+CSS = """
 <style>
     /* Main layout */
     .main {
@@ -71,16 +69,6 @@ st.markdown("""
         font-weight: 700;
     }
 
-    /* Info boxes */
-    .info-box {
-        background-color: white;
-        border-left: 4px solid #01A982;
-        padding: 1rem 1.5rem;
-        border-radius: 8px;
-        margin: 1rem 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.05);
-    }
-
     /* Filter section */
     .filter-section {
         background-color: white;
@@ -140,11 +128,46 @@ st.markdown("""
         font-weight: 500;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CSS, unsafe_allow_html=True)
+
+# Tables exposed in the Data Browser, by category
+TABLE_CATEGORIES = {
+    "Source Data (Excel)": {
+        "Customers": "dim_customer",
+        "Products": "dim_product",
+        "Services": "dim_service",
+        "Opportunities": "fact_opportunity",
+        "Service Credits": "fact_service_credit"
+    },
+    "LS_SKU Catalog": {
+        "LS_SKU Products": "dim_ls_sku_product",
+        "LS_SKU Services": "dim_ls_sku_service",
+        "SKU Codes": "dim_sku_code",
+        "Product-Service Mappings": "map_product_service_sku",
+        "Service-SKU Mappings": "map_service_sku"
+    },
+    "Mappings & Integration": {
+        "Install Base to LS_SKU": "map_install_base_to_ls_sku",
+        "Customer Mappings": "map_customer",
+        "Practice Mappings": "map_practice"
+    },
+    "Fact Tables": {
+        "Install Base": "fact_install_base",
+        "Opportunities": "fact_opportunity",
+        "Service Credits": "fact_service_credit",
+        "A&PS Projects": "fact_aps_project"
+    }
+}
+
+# Only these table names are ever interpolated into browser queries
+BROWSABLE_TABLES = frozenset(
+    table for tables in TABLE_CATEGORIES.values() for table in tables.values()
+)
 
-@st.cache_data(ttl=3600)
 def load_database_data():
-    """Load all data from SQLite database"""
+    """Load all data from SQLite database (cached by the loader, keyed on the file's mtime)"""
     loader = OneleadSQLiteLoader("data/onelead.db")
     return loader.load_all_data()
 
@@ -153,6 +176,106 @@ def get_recommendation_engine():
     """Get cached recommendation engine instance"""
     return EnhancedRecommendationEngine('data/onelead.db')
 
+@st.cache_resource
+def get_db_connection():
+    """Get cached read-only SQLite connection shared across reruns"""
+    import sqlite3
+
+    return sqlite3.connect('file:data/onelead.db?mode=ro', uri=True, check_same_thread=False)
+
+@st.cache_data(ttl=600)
+def get_overview_counts():
+    """Get customer, product, service and install base counts in one query"""
+    return get_db_connection().execute("""
+        SELECT
+            (SELECT COUNT(*) FROM dim_customer),
+            (SELECT COUNT(*) FROM dim_product),
+            (SELECT COUNT(*) FROM dim_ls_sku_service),
+            (SELECT COUNT(*) FROM fact_install_base)
+    """).fetchone()
+
+@st.cache_data(ttl=600)
+def get_table_row_count(table):
+    """Get the row count of a browsable table for the data browser pager"""
+    if table not in BROWSABLE_TABLES:
+        raise ValueError(f"Table not available for browsing: {table}")
+    return get_db_connection().execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+@st.cache_data(ttl=3600)
+def load_all_recommendations():
+    """Generate the full quote-ready export once and share it across tabs"""
+    recs = get_recommendation_engine().generate_quote_ready_export()
+
+    # Low-cardinality columns used for filtering and grouping
+    for col in ('urgency', 'customer_name'):
+        if col in recs.columns:
+            recs[col] = recs[col].astype('category')
+
+    return recs
+
+@st.cache_data(ttl=3600)
+def get_recommendation_counts():
+    """Get total and quote-ready recommendation counts for the overview"""
+    recs = load_all_recommendations()
+    quote_ready = int(recs['quote_ready'].sum()) if 'quote_ready' in recs.columns else 0
+    return len(recs), quote_ready
+
+@st.cache_data(ttl=3600)
+def get_customer_options():
+    """Get the sorted customer filter options"""
+    customers = load_database_data().get('customers', pd.DataFrame())
+    if customers.empty or 'customer_name' not in customers.columns:
+        return ['All Customers']
+    return ['All Customers'] + sorted(customers['customer_name'].unique().tolist())
+
+@st.cache_data(ttl=1800)
+def load_mapping_data():
+    """Load the Install Base to LS_SKU product mappings"""
+    return pd.read_sql_query("""
+        SELECT
+            p.product_description AS "Install Base Product",
+            lp.product_name AS "LS_SKU Product",
+            m.confidence_score AS "Confidence",
+            m.match_method AS "Method",
+            CASE
+                WHEN m.confidence_score >= 90 THEN '🟢 High'
+                WHEN m.confidence_score >= 75 THEN '🟡 Medium'
+                ELSE '🔴 Low'
+            END AS "Quality"
+        FROM map_install_base_to_ls_sku m
+        JOIN dim_product p ON m.product_key = p.product_key
+        JOIN dim_ls_sku_product lp ON m.ls_product_key = lp.ls_product_key
+        ORDER BY m.confidence_score DESC
+    """, get_db_connection(), dtype_backend='pyarrow')
+
+@st.cache_data(ttl=1800)
+def get_mapping_counts():
+    """Get mapping method and quality counts for the mapping charts"""
+    mapping_df = load_mapping_data()
+    return mapping_df['Method'].value_counts(), mapping_df['Quality'].value_counts()
+
+@st.cache_resource(ttl=1800)
+def get_mapping_figures():
+    """Build the mapping method pie and confidence bar charts once per TTL window"""
+    import plotly.express as px
+
+    method_counts, quality_counts = get_mapping_counts()
+
+    method_fig = px.pie(values=method_counts.values, names=method_counts.index)
+    method_fig.update_traces(textposition='inside', textinfo='percent+label')
+    method_fig.update_layout(showlegend=False, height=300)
+
+    quality_fig = px.bar(x=quality_counts.index, y=quality_counts.values, color=quality_counts.index,
+                         color_discrete_map={'🟢 High': '#28a745', '🟡 Medium': '#ffc107', '🔴 Low': '#dc3545'})
+    quality_fig.update_layout(showlegend=False, xaxis_title="", yaxis_title="Count", height=300)
+
+    return method_fig, quality_fig
+
+@st.cache_data
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV bytes for download buttons"""
+    return df.to_csv(index=False).encode('utf-8')
+
 def show_overview():
     """Dashboard overview with key metrics"""
     st.title("🎯 HPE OneLead Service Recommendations")
@@ -160,16 +283,13 @@ def show_overview():
     st.markdown("---")
 
     # Key metrics
-    engine = get_recommendation_engine()
     data = load_database_data()
 
     col1, col2, col3, col4 = st.columns(4)
 
     # Get recommendation count
     try:
-        recs = engine.generate_quote_ready_export()
-        total_recs = len(recs)
-        quote_ready = recs['quote_ready'].sum() if 'quote_ready' in recs.columns else 0
+        total_recs, quote_ready = get_recommendation_counts()
     except:
         total_recs = 0
         quote_ready = 0
@@ -193,9 +313,6 @@ def show_recommendations():
     st.header("🎯 Service Recommendations")
     st.markdown("Browse SKU-level service recommendations for your customers")
 
-    engine = get_recommendation_engine()
-    data = load_database_data()
-
     # Filter section
     with st.container():
         st.markdown('<div class="filter-section">', unsafe_allow_html=True)
@@ -223,9 +340,8 @@ def show_recommendations():
 
         with col3:
             # Get customer list
-            customers = data['customers'] if 'customers' in data and not data['customers'].empty else pd.DataFrame()
-            if not customers.empty and 'customer_name' in customers.columns:
-                customer_options = ['All Customers'] + sorted(customers['customer_name'].unique().tolist())
+            customer_options = get_customer_options()
+            if len(customer_options) > 1:
                 selected_customer = st.selectbox(
                     "Customer",
                     options=customer_options,
@@ -236,17 +352,26 @@ def show_recommendations():
 
         st.markdown('</div>', unsafe_allow_html=True)
 
+    # Start the table back on the first page whenever the filters change
+    table_filters = (tuple(urgency_filter), confidence_min, selected_customer)
+    if st.session_state.get('table_filters') != table_filters:
+        st.session_state['table_filters'] = table_filters
+        st.session_state['table_page'] = 0
+
     # Get recommendations
     try:
         customer_id = None if selected_customer == 'All Customers' else selected_customer
-        recs = engine.generate_quote_ready_export(
-            customer_id=customer_id,
-            urgency_filter=urgency_filter if urgency_filter else None
-        )
-
-        # Apply confidence filter
-        if not recs.empty and 'confidence' in recs.columns:
-            recs = recs[recs['confidence'] >= confidence_min]
+        recs = load_all_recommendations()
+
+        # Combine urgency, customer and confidence filters into one mask
+        mask = np.ones(len(recs), dtype=bool)
+        if urgency_filter:
+            mask &= recs['urgency'].isin(urgency_filter).to_numpy()
+        if customer_id:
+            mask &= (recs['customer_name'] == customer_id).to_numpy()
+        if 'confidence' in recs.columns:
+            mask &= (recs['confidence'] >= confidence_min).to_numpy()
+        recs = recs[mask]
 
         if not recs.empty:
             st.markdown(f"**Showing {len(recs)} recommendations**")
@@ -299,29 +424,60 @@ def show_recommendations():
                     'quote_ready': st.column_config.CheckboxColumn('Quote Ready')
                 }
 
+                # Only send the current page to the browser
+                page_size = 100
+                page_count = max((len(display_df) - 1) // page_size + 1, 1)
+                page = min(st.session_state.get('table_page', 0), page_count - 1)
+                start = page * page_size
+
                 st.dataframe(
-                    display_df,
+                    display_df.iloc[start:start + page_size],
                     column_config=column_config,
                     hide_index=True,
                     use_container_width=True,
                     height=500
                 )
+
+                col1, col2, col3 = st.columns([1, 2, 1])
+                with col1:
+                    if st.button("◀ Prev", disabled=page == 0):
+                        st.session_state['table_page'] = page - 1
+                        st.rerun()
+                with col2:
+                    st.markdown(f"Page {page + 1} of {page_count}")
+                with col3:
+                    if st.button("Next ▶", disabled=page >= page_count - 1):
+                        st.session_state['table_page'] = page + 1
+                        st.rerun()
             else:
                 # Card view
-                for idx, row in recs.iterrows():
-                    with st.expander(f"**{row.get('customer_name', 'N/A')}** - {row.get('service_name', 'N/A')}", expanded=False):
+                card_defaults = {
+                    'customer_name': 'N/A',
+                    'service_name': 'N/A',
+                    'product_name': 'N/A',
+                    'sku_codes': 'Contact HPE',
+                    'urgency': 'N/A',
+                    'confidence': 0,
+                    'quote_ready': False
+                }
+                cards = pd.DataFrame({
+                    col: recs[col] if col in recs.columns else default
+                    for col, default in card_defaults.items()
+                }, index=recs.index)
+
+                for row in cards.itertuples(index=False):
+                    with st.expander(f"**{row.customer_name}** - {row.service_name}", expanded=False):
                         col1, col2 = st.columns(2)
 
                         with col1:
-                            st.markdown(f"**Product:** {row.get('product_name', 'N/A')}")
-                            st.markdown(f"**SKU Code:** `{row.get('sku_codes', 'Contact HPE')}`")
-                            st.markdown(f"**Urgency:** {row.get('urgency', 'N/A')}")
+                            st.markdown(f"**Product:** {row.product_name}")
+                            st.markdown(f"**SKU Code:** `{row.sku_codes}`")
+                            st.markdown(f"**Urgency:** {row.urgency}")
 
                         with col2:
-                            st.markdown(f"**Service:** {row.get('service_name', 'N/A')}")
-                            confidence = row.get('confidence', 0)
-                            st.markdown(f"**Confidence:** {confidence}%")
-                            quote_ready = "✅ Yes" if row.get('quote_ready', False) else "❌ No"
+                            st.markdown(f"**Service:** {row.service_name}")
+                            st.markdown(f"**Confidence:** {row.confidence}%")
+                            quote_ready = "✅ Yes" if row.quote_ready else "❌ No"
                             st.markdown(f"**Quote Ready:** {quote_ready}")
 
             # Export options
@@ -329,7 +485,7 @@ def show_recommendations():
             col1, col2, col3 = st.columns([1, 1, 2])
 
             with col1:
-                csv = recs.to_csv(index=False)
+                csv = to_csv_bytes(recs)
                 st.download_button(
                     label="📥 Download All",
                     data=csv,
@@ -341,7 +497,7 @@ def show_recommendations():
                 if 'quote_ready' in recs.columns:
                     quote_ready_df = recs[recs['quote_ready'] == True]
                     if not quote_ready_df.empty:
-                        csv_ready = quote_ready_df.to_csv(index=False)
+                        csv_ready = to_csv_bytes(quote_ready_df)
                         st.download_button(
                             label="📄 Download Quote-Ready",
                             data=csv_ready,
@@ -360,31 +516,25 @@ def show_customers():
     st.header("👥 Customers")
     st.markdown("View recommendations grouped by customer")
 
-    engine = get_recommendation_engine()
-    data = load_database_data()
-
     try:
-        recs = engine.generate_quote_ready_export()
+        recs = load_all_recommendations()
 
         if not recs.empty and 'customer_name' in recs.columns:
-            # Group by customer
-            customer_summary = recs.groupby('customer_name').agg({
-                'service_name': 'count',
-                'quote_ready': 'sum' if 'quote_ready' in recs.columns else lambda x: 0
-            }).reset_index()
-
-            customer_summary.columns = ['Customer', 'Total Recommendations', 'Quote-Ready']
-            customer_summary = customer_summary.sort_values('Total Recommendations', ascending=False)
+            # Summary and per-customer rows come from the same cached frame, so they always agree
+            groups = recs.groupby('customer_name', sort=False, observed=True)
+            customer_summary = pd.DataFrame({
+                'total_recs': groups.size(),
+                'quote_ready_count': groups['quote_ready'].sum() if 'quote_ready' in recs.columns else 0
+            }).sort_values('total_recs', ascending=False, kind='stable')
 
             st.markdown(f"**{len(customer_summary)} customers with recommendations**")
             st.markdown("---")
 
-            # Display customer cards
-            for _, customer_row in customer_summary.iterrows():
-                customer_name = customer_row['Customer']
-                total_recs = customer_row['Total Recommendations']
-                quote_ready_count = customer_row['Quote-Ready']
+            # Partition recommendations by customer in a single pass
+            customer_groups = dict(tuple(groups))
 
+            # Display customer cards
+            for customer_name, total_recs, quote_ready_count in customer_summary.itertuples(name=None):
                 with st.expander(f"**{customer_name}** ({total_recs} recommendations)", expanded=False):
                     col1, col2, col3 = st.columns(3)
 
@@ -397,7 +547,7 @@ def show_customers():
                         st.metric("Ready %", f"{ready_pct:.0f}%")
 
                     # Show customer's recommendations
-                    customer_recs = recs[recs['customer_name'] == customer_name]
+                    customer_recs = customer_groups[customer_name]
 
                     display_cols = ['service_name', 'sku_codes', 'urgency', 'confidence']
                     display_cols = [c for c in display_cols if c in customer_recs.columns]
@@ -409,7 +559,7 @@ def show_customers():
                     )
 
                     # Download button for this customer
-                    csv = customer_recs.to_csv(index=False)
+                    csv = to_csv_bytes(customer_recs)
                     st.download_button(
                         label=f"📥 Download {customer_name}'s Recommendations",
                         data=csv,
@@ -425,13 +575,14 @@ def show_customers():
 
 def show_analytics():
     """Analytics and insights"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
     st.header("📊 Analytics")
     st.markdown("Insights into recommendations and coverage")
 
-    engine = get_recommendation_engine()
-
     try:
-        recs = engine.generate_quote_ready_export()
+        recs = load_all_recommendations()
 
         if not recs.empty:
             col1, col2 = st.columns(2)
@@ -440,17 +591,17 @@ def show_analytics():
                 st.subheader("Recommendations by Urgency")
                 if 'urgency' in recs.columns:
                     urgency_counts = recs['urgency'].value_counts()
-                    fig = px.pie(
+                    urgency_colors = {
+                        'Critical': '#DC143C',
+                        'High': '#FF6B35',
+                        'Medium': '#FFA500',
+                        'Low': '#90EE90'
+                    }
+                    fig = go.Figure(go.Pie(
                         values=urgency_counts.values,
-                        names=urgency_counts.index,
-                        color=urgency_counts.index,
-                        color_discrete_map={
-                            'Critical': '#DC143C',
-                            'High': '#FF6B35',
-                            'Medium': '#FFA500',
-                            'Low': '#90EE90'
-                        }
-                    )
+                        labels=urgency_counts.index.to_numpy(),
+                        marker=dict(colors=[urgency_colors.get(u) for u in urgency_counts.index])
+                    ))
                     fig.update_traces(textposition='inside', textinfo='percent+label')
                     fig.update_layout(showlegend=False, height=350)
                     st.plotly_chart(fig, use_container_width=True)
@@ -476,18 +627,23 @@ def show_analytics():
             st.markdown("---")
             st.subheader("SKU Code Coverage")
 
+            # Count missing SKU codes in one pass and derive the rest
+            if 'sku_codes' in recs.columns:
+                no_sku = int(pd.isna(recs['sku_codes'].to_numpy()).sum())
+                has_sku = len(recs) - no_sku
+            else:
+                has_sku = no_sku = 0
+
             col1, col2, col3 = st.columns(3)
 
             with col1:
-                has_sku = recs['sku_codes'].notna().sum() if 'sku_codes' in recs.columns else 0
                 st.metric("Services with SKU", has_sku)
 
             with col2:
-                no_sku = recs['sku_codes'].isna().sum() if 'sku_codes' in recs.columns else 0
                 st.metric("Needs Follow-up", no_sku)
 
             with col3:
-                coverage = (has_sku / len(recs) * 100) if len(recs) > 0 else 0
+                coverage = (has_sku * 100.0 / len(recs)) if len(recs) > 0 else 0
                 st.metric("SKU Coverage", f"{coverage:.1f}%")
 
         else:
@@ -502,31 +658,25 @@ def show_data_browser():
     st.markdown("Explore source data and database mappings")
 
     data = load_database_data()
-    conn = sqlite3.connect('data/onelead.db')
+    conn = get_db_connection()
 
     # Data overview
     st.subheader("📊 Data Overview")
 
     col1, col2, col3, col4 = st.columns(4)
 
+    customer_count, product_count, service_count, install_count = get_overview_counts()
+
     with col1:
-        cursor = conn.execute("SELECT COUNT(*) FROM dim_customer")
-        customer_count = cursor.fetchone()[0]
         st.metric("Customers", customer_count)
 
     with col2:
-        cursor = conn.execute("SELECT COUNT(*) FROM dim_product")
-        product_count = cursor.fetchone()[0]
         st.metric("Products", product_count)
 
     with col3:
-        cursor = conn.execute("SELECT COUNT(*) FROM dim_ls_sku_service")
-        service_count = cursor.fetchone()[0]
         st.metric("LS_SKU Services", service_count)
 
     with col4:
-        cursor = conn.execute("SELECT COUNT(*) FROM fact_install_base")
-        install_count = cursor.fetchone()[0]
         st.metric("Install Base", install_count)
 
     st.markdown("---")
@@ -536,56 +686,51 @@ def show_data_browser():
 
     table_category = st.radio(
         "Select Category",
-        options=["Source Data (Excel)", "LS_SKU Catalog", "Mappings & Integration", "Fact Tables"],
+        options=list(TABLE_CATEGORIES.keys()),
         horizontal=True
     )
 
-    if table_category == "Source Data (Excel)":
-        table_options = {
-            "Customers": "dim_customer",
-            "Products": "dim_product",
-            "Services": "dim_service",
-            "Opportunities": "fact_opportunity",
-            "Service Credits": "fact_service_credit"
-        }
-    elif table_category == "LS_SKU Catalog":
-        table_options = {
-            "LS_SKU Products": "dim_ls_sku_product",
-            "LS_SKU Services": "dim_ls_sku_service",
-            "SKU Codes": "dim_sku_code",
-            "Product-Service Mappings": "map_product_service_sku",
-            "Service-SKU Mappings": "map_service_sku"
-        }
-    elif table_category == "Mappings & Integration":
-        table_options = {
-            "Install Base to LS_SKU": "map_install_base_to_ls_sku",
-            "Customer Mappings": "map_customer",
-            "Practice Mappings": "map_practice"
-        }
-    else:  # Fact Tables
-        table_options = {
-            "Install Base": "fact_install_base",
-            "Opportunities": "fact_opportunity",
-            "Service Credits": "fact_service_credit",
-            "A&PS Projects": "fact_aps_project"
-        }
+    table_options = TABLE_CATEGORIES[table_category]
 
     selected_table_name = st.selectbox("Select Table", options=list(table_options.keys()))
     selected_table = table_options[selected_table_name]
 
+    if selected_table not in BROWSABLE_TABLES:
+        st.error(f"Table not available for browsing: {selected_table}")
+        return
+
     # Load and display table
     try:
-        query = f"SELECT * FROM {selected_table} LIMIT 100"
-        df = pd.read_sql(query, conn)
+        columns = pd.read_sql(f"PRAGMA table_info({selected_table})", conn)['name'].tolist()
 
-        st.markdown(f"**{selected_table_name}** - Showing up to 100 rows")
-        st.markdown(f"Total columns: {len(df.columns)}")
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            selected_columns = st.multiselect("Columns", options=columns, default=columns[:12])
+
+        page_size = 100
+        page_count = max((get_table_row_count(selected_table) - 1) // page_size + 1, 1)
+
+        with col2:
+            page = int(st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1))
+
+        if not selected_columns:
+            st.info("Select at least one column to browse")
+            return
+
+        column_list = ", ".join(f'"{col}"' for col in selected_columns)
+        # Only the limit and offset vary between pages, so SQLite reuses the prepared statement
+        query = f"SELECT {column_list} FROM {selected_table} LIMIT ? OFFSET ?"
+        df = pd.read_sql(query, conn, params=(page_size, (page - 1) * page_size), dtype_backend='pyarrow')
+
+        st.markdown(f"**{selected_table_name}** - Page {page} of {page_count}, showing {len(df)} rows ({page_size} per page)")
+        st.markdown(f"Columns: {len(df.columns)} of {len(columns)}")
 
         # Display table
         st.dataframe(df, use_container_width=True, height=400)
 
         # Download option
-        csv = df.to_csv(index=False)
+        csv = to_csv_bytes(df)
         st.download_button(
             label=f"📥 Download {selected_table_name}",
             data=csv,
@@ -596,14 +741,12 @@ def show_data_browser():
     except Exception as e:
         st.error(f"Error loading table: {str(e)}")
 
-    conn.close()
-
 def show_database_mapping():
     """Show database schema and mapping statistics"""
     st.header("🗄️ Database Schema & Mappings")
     st.markdown("Understanding how data flows through the system")
 
-    conn = sqlite3.connect('data/onelead.db')
+    conn = get_db_connection()
 
     # Mapping Statistics
     st.subheader("🔗 Data Integration Statistics")
@@ -652,49 +795,22 @@ def show_database_mapping():
     # Detailed mapping view
     st.subheader("🔍 Product-to-LS_SKU Mappings")
 
-    cursor = conn.execute("""
-        SELECT
-            p.product_description,
-            lp.product_name as ls_sku_product,
-            m.confidence_score,
-            m.match_method,
-            CASE
-                WHEN m.confidence_score >= 90 THEN '🟢 High'
-                WHEN m.confidence_score >= 75 THEN '🟡 Medium'
-                ELSE '🔴 Low'
-            END as confidence_level
-        FROM map_install_base_to_ls_sku m
-        JOIN dim_product p ON m.product_key = p.product_key
-        JOIN dim_ls_sku_product lp ON m.ls_product_key = lp.ls_product_key
-        ORDER BY m.confidence_score DESC
-    """)
-
-    mapping_df = pd.DataFrame(
-        cursor.fetchall(),
-        columns=['Install Base Product', 'LS_SKU Product', 'Confidence', 'Method', 'Quality']
-    )
+    mapping_df = load_mapping_data()
 
     if not mapping_df.empty:
         st.dataframe(mapping_df, use_container_width=True, height=300)
+        method_fig, quality_fig = get_mapping_figures()
 
         # Mapping quality chart
         col1, col2 = st.columns(2)
 
         with col1:
             st.markdown("**Mapping Methods Used**")
-            method_counts = mapping_df['Method'].value_counts()
-            fig = px.pie(values=method_counts.values, names=method_counts.index)
-            fig.update_traces(textposition='inside', textinfo='percent+label')
-            fig.update_layout(showlegend=False, height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(method_fig, use_container_width=True)
 
         with col2:
             st.markdown("**Confidence Distribution**")
-            quality_counts = mapping_df['Quality'].value_counts()
-            fig = px.bar(x=quality_counts.index, y=quality_counts.values, color=quality_counts.index,
-                        color_discrete_map={'🟢 High': '#28a745', '🟡 Medium': '#ffc107', '🔴 Low': '#dc3545'})
-            fig.update_layout(showlegend=False, xaxis_title="", yaxis_title="Count", height=300)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(quality_fig, use_container_width=True)
     else:
         st.info("No product mappings found. Run the LS_SKU data loader to create mappings.")
 
@@ -733,8 +849,6 @@ def show_database_mapping():
         4. **Recommendation Engine** → Joins all tables to generate recommendations
         """)
 
-    conn.close()
-
 def main():
     """Main application"""
 
@@ -5,15 +5,14 @@ Shows the complete data flow from Excel → Database → Recommendations
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import numpy as np
 import sqlite3
 from datetime import datetime
 from pathlib import Path
+from importlib.util import find_spec
 
 # Import data loaders
 from data_processing.sqlite_loader import OneleadSQLiteLoader
-from data_processing.enhanced_recommendation_engine import EnhancedRecommendationEngine
 
 # Page configuration
 st.set_page_config(
@@ -93,38 +92,270 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)
 def load_database_data():
-    """Load all data from SQLite database"""
+    """Load all data from SQLite database (cached by the loader, keyed on the file's mtime)"""
     loader = OneleadSQLiteLoader("data/onelead.db")
     return loader.load_all_data()
 
 @st.cache_resource
 def get_recommendation_engine():
     """Get cached recommendation engine instance"""
+    from data_processing.enhanced_recommendation_engine import EnhancedRecommendationEngine
+
     return EnhancedRecommendationEngine('data/onelead.db')
 
+@st.cache_data(ttl=600)
+def load_recommendations(customer_id=None, urgency_filter=()):
+    """Generate quote-ready recommendations, memoized per customer and urgency tuple"""
+    return get_recommendation_engine().generate_quote_ready_export(
+        customer_id=customer_id,
+        urgency_filter=list(urgency_filter) if urgency_filter else None
+    )
+
+@st.cache_data(ttl=600)
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV bytes for download buttons"""
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_resource
+def get_db_connection():
+    """Get cached read-only SQLite connection shared across reruns"""
+    conn = sqlite3.connect('file:data/onelead.db?mode=ro', uri=True, check_same_thread=False)
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA cache_size=-65536")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+# Priority labels with urgency emoji for the Step 5 tables
+URGENCY_LABELS = {
+    'Critical': '🔴 Critical',
+    'High': '🟠 High',
+    'Medium': '🟡 Medium',
+    'Low': '🟢 Low'
+}
+
+# Prefer the Rust-based calamine reader when installed; openpyxl otherwise
+EXCEL_ENGINE = 'calamine' if find_spec('python_calamine') else 'openpyxl'
+
+@st.cache_data(ttl=3600)
+def load_install_base_sample():
+    """Load the first 10 Install Base rows shown in the Step 1 preview"""
+    return pd.read_excel(
+        'data/DataExportAug29th.xlsx',
+        sheet_name='Install Base',
+        engine=EXCEL_ENGINE,
+        usecols=['Account_Sales_Territory_Id', 'Product_Name', 'Product_Platform_Description_Name', 'Support_Status'],
+        nrows=10
+    )
+
+@st.cache_data(ttl=3600)
+def load_ls_sku_sample():
+    """Load the first 10 LS_SKU catalog rows shown in the Step 1 preview"""
+    return pd.read_excel(
+        'data/LS_SKU_for_Onelead.xlsx',
+        sheet_name='Sheet2',
+        header=4,
+        engine=EXCEL_ENGINE,
+        usecols=['Product', 'Services Offered'],
+        nrows=10
+    )
+
+@st.cache_data(ttl=300)
 def get_db_stats():
     """Get database statistics"""
-    conn = sqlite3.connect('data/onelead.db')
+    row = get_db_connection().execute("""
+        SELECT
+            (SELECT COUNT(*) FROM dim_ls_sku_product),
+            (SELECT COUNT(*) FROM dim_ls_sku_service),
+            (SELECT COUNT(*) FROM dim_sku_code),
+            (SELECT COUNT(*) FROM map_product_service_sku),
+            (SELECT COUNT(*) FROM fact_install_base),
+            (SELECT COUNT(*) FROM dim_customer),
+            (SELECT COUNT(*) FROM map_install_base_to_ls_sku)
+    """).fetchone()
+
+    keys = [
+        # LS_SKU data
+        'ls_products', 'ls_services', 'sku_codes', 'product_service_mappings',
+        # Install Base data
+        'install_base_products', 'customers',
+        # Product matching
+        'matched_products'
+    ]
+    stats = dict(zip(keys, row))
+
+    # Database health
+    stats['tables'] = [
+        name for (name,) in get_db_connection().execute(
+            "SELECT name FROM sqlite_master WHERE type='table' ORDER BY name"
+        )
+    ]
+
+    return stats
 
-    stats = {}
+@st.cache_data(ttl=60)
+def get_db_size_mb():
+    """Get the database file size in megabytes"""
+    return Path('data/onelead.db').stat().st_size / (1024 * 1024)
 
-    # LS_SKU data
-    stats['ls_products'] = conn.execute("SELECT COUNT(*) FROM dim_ls_sku_product").fetchone()[0]
-    stats['ls_services'] = conn.execute("SELECT COUNT(*) FROM dim_ls_sku_service").fetchone()[0]
-    stats['sku_codes'] = conn.execute("SELECT COUNT(*) FROM dim_sku_code").fetchone()[0]
-    stats['product_service_mappings'] = conn.execute("SELECT COUNT(*) FROM map_product_service_sku").fetchone()[0]
+@st.cache_data(ttl=3600)
+def get_source_data_stats():
+    """Get Step 1 counts from the source workbooks, reading only the counted columns"""
+    df_ib = pd.read_excel(
+        'data/DataExportAug29th.xlsx',
+        sheet_name='Install Base',
+        engine=EXCEL_ENGINE,
+        usecols=['Account_Sales_Territory_Id', 'Product_Name']
+    )
+    df_sku = pd.read_excel(
+        'data/LS_SKU_for_Onelead.xlsx',
+        sheet_name='Sheet2',
+        header=4,
+        engine=EXCEL_ENGINE,
+        usecols=['Product', 'Services Offered']
+    )
 
-    # Install Base data
-    stats['install_base_products'] = conn.execute("SELECT COUNT(*) FROM fact_install_base").fetchone()[0]
-    stats['customers'] = conn.execute("SELECT COUNT(*) FROM dim_customer").fetchone()[0]
+    return {
+        'install_base_products': len(df_ib),
+        'product_models': df_ib['Product_Name'].nunique(),
+        'customer_accounts': df_ib['Account_Sales_Territory_Id'].nunique(),
+        'ls_products': df_sku['Product'].nunique(),
+        'ls_services': df_sku['Services Offered'].nunique(),
+        'catalog_rows': len(df_sku)
+    }
 
-    # Product matching
-    stats['matched_products'] = conn.execute("SELECT COUNT(*) FROM map_install_base_to_ls_sku").fetchone()[0]
+@st.cache_data(ttl=600)
+def get_match_stats():
+    """Get match count, average confidence and 10-point confidence buckets"""
+    conn = get_db_connection()
+    joins = """
+    FROM dim_product p
+    JOIN map_install_base_to_ls_sku m ON p.product_key = m.product_key
+    JOIN dim_ls_sku_product ls ON m.ls_product_key = ls.ls_product_key
+    """
 
-    conn.close()
-    return stats
+    total_matches, avg_confidence = conn.execute(
+        f"SELECT COUNT(*), AVG(m.confidence_score) {joins}"
+    ).fetchone()
+
+    buckets = pd.read_sql_query(f"""
+    SELECT
+        CAST(m.confidence_score / 10 AS INTEGER) * 10 as bucket,
+        COUNT(*) as count
+    {joins}
+    GROUP BY bucket
+    ORDER BY bucket
+    """, conn)
+
+    return total_matches, avg_confidence, buckets
+
+@st.cache_data(ttl=600)
+def build_confidence_bar(bucket_items):
+    """Build the Step 3 confidence distribution chart from (bucket, count) pairs"""
+    import plotly.express as px
+
+    return px.bar(
+        x=[bucket for bucket, _ in bucket_items],
+        y=[count for _, count in bucket_items],
+        title='Confidence Score Distribution',
+        labels={'x': 'Confidence Score', 'y': 'Count'}
+    )
+
+@st.cache_data(ttl=600)
+def build_priority_pie(urgency_items):
+    """Build the Step 4 priority pie from (urgency, count) pairs"""
+    import plotly.express as px
+
+    return px.pie(
+        values=[count for _, count in urgency_items],
+        names=[urgency for urgency, _ in urgency_items],
+        title='Priority Distribution',
+        color_discrete_map={
+            'Critical': '#ff4b4b',
+            'High': '#ffa500',
+            'Medium': '#ffeb3b',
+            'Low': '#4caf50'
+        }
+    )
+
+@st.cache_data(ttl=600)
+def build_top_customers_bar(customer_items):
+    """Build the Step 4 top customers bar from (customer, count) pairs"""
+    import plotly.express as px
+
+    return px.bar(
+        x=[count for _, count in customer_items],
+        y=[customer for customer, _ in customer_items],
+        orientation='h',
+        title='Recommendations per Customer',
+        labels={'x': 'Recommendations', 'y': 'Customer'}
+    )
+
+def build_recommendation_reasons(recs):
+    """Precompute the 'Why Recommended' reasons for every recommendation row"""
+    blank = pd.Series(np.nan, index=recs.index)
+    platform = recs.get('product_platform', blank)
+    urgency = recs.get('urgency', blank)
+    support_status = recs.get('support_status', blank)
+    days = recs.get('days_to_eol', blank)
+    confidence = recs.get('match_confidence', blank)
+    service_name = recs.get('service_name', blank).astype(str).str.lower()
+
+    # Product-based reasoning
+    platform_reason = np.where(
+        platform.notna(), 'Product is in **' + platform.astype(str) + '** category', ''
+    )
+
+    # Urgency reasoning
+    days_text = days.astype(str)
+    eol_reason = np.select(
+        [
+            (urgency == 'Critical') & (support_status == 'Expired'),
+            (urgency == 'Critical') & days.notna() & (days < 90),
+            (urgency == 'High') & days.notna() & (days < 180),
+            urgency == 'Low'
+        ],
+        [
+            "⚠️ **Support has expired** - service renewal needed immediately",
+            "⚠️ **Product EOL in " + days_text + " days** - urgent service required",
+            "⏰ **Product EOL in " + days_text + " days** - service recommended soon",
+            "✅ Product is healthy - proactive maintenance recommended"
+        ],
+        default=''
+    )
+
+    # Match confidence reasoning
+    match_reason = np.select(
+        [confidence == 100, confidence >= 85, confidence >= 70],
+        [
+            "🎯 **Exact product match** - highly relevant service",
+            "✅ **Strong product match** - recommended by matching algorithm",
+            "📊 **Category match** - service fits product type"
+        ],
+        default=''
+    )
+
+    # Service type reasoning
+    service_reason = np.select(
+        [
+            service_name.str.contains('health check', regex=False),
+            service_name.str.contains('upgrade|firmware'),
+            service_name.str.contains('install|startup'),
+            service_name.str.contains('optimization', regex=False),
+            service_name.str.contains('migration', regex=False)
+        ],
+        [
+            "🏥 Validates system health and identifies issues",
+            "⬆️ Keeps system up-to-date with latest features and security",
+            "🚀 Ensures proper setup and configuration",
+            "⚡ Improves performance and efficiency",
+            "🔄 Facilitates smooth transition to new systems"
+        ],
+        default=''
+    )
+
+    reasons = zip(platform_reason, eol_reason, match_reason, service_reason)
+    return dict(zip(recs.index, ([r for r in row if r] for row in reasons)))
 
 def show_step_1_source_data():
     """Step 1: Show source Excel files"""
@@ -133,52 +364,50 @@ def show_step_1_source_data():
     st.markdown('<div class="step-desc">Two Excel files provide the foundation data</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
+    try:
+        stats = get_source_data_stats()
+    except Exception as e:
+        st.error(f"Error loading source workbooks: {str(e)}")
+        return
+
     col1, col2 = st.columns(2)
 
     with col1:
         st.markdown("### 📊 DataExportAug29th.xlsx")
         st.markdown("**Customer & Install Base Data**")
 
-        try:
-            # Load Install Base sheet
-            df_ib = pd.read_excel('data/DataExportAug29th.xlsx', sheet_name='Install Base')
-
-            st.metric("Total Products", len(df_ib))
-            st.metric("Unique Product Models", df_ib['Product_Name'].nunique())
-            st.metric("Customer Accounts", df_ib['Account_Sales_Territory_Id'].nunique())
+        st.metric("Total Products", stats['install_base_products'])
+        st.metric("Unique Product Models", stats['product_models'])
+        st.metric("Customer Accounts", stats['customer_accounts'])
 
-            with st.expander("📋 View Sample Install Base Data"):
+        # Only parse the workbook when the sample is requested
+        if st.toggle("📋 View Sample Install Base Data", key='show_ib_sample'):
+            try:
                 st.dataframe(
-                    df_ib[['Account_Sales_Territory_Id', 'Product_Name', 'Product_Platform_Description_Name', 'Support_Status']].head(10),
+                    load_install_base_sample(),
                     use_container_width=True,
                     hide_index=True
                 )
-        except Exception as e:
-            st.error(f"Error loading Install Base: {str(e)}")
+            except Exception as e:
+                st.error(f"Error loading Install Base: {str(e)}")
 
     with col2:
         st.markdown("### 📋 LS_SKU_for_Onelead.xlsx")
         st.markdown("**HPE Service Catalog**")
 
-        try:
-            # Load LS_SKU sheet
-            df_sku = pd.read_excel('data/LS_SKU_for_Onelead.xlsx', sheet_name='Sheet2', header=4)
-
-            products = df_sku['Product'].dropna().nunique()
-            services = df_sku['Services Offered'].dropna().nunique()
-
-            st.metric("HPE Product Categories", products)
-            st.metric("Available Services", services)
-            st.metric("Service Catalog Rows", len(df_sku))
+        st.metric("HPE Product Categories", stats['ls_products'])
+        st.metric("Available Services", stats['ls_services'])
+        st.metric("Service Catalog Rows", stats['catalog_rows'])
 
-            with st.expander("📋 View Sample LS_SKU Catalog"):
+        if st.toggle("📋 View Sample LS_SKU Catalog", key='show_sku_sample'):
+            try:
                 st.dataframe(
-                    df_sku[['Product', 'Services Offered']].dropna().head(10),
+                    load_ls_sku_sample(),
                     use_container_width=True,
                     hide_index=True
                 )
-        except Exception as e:
-            st.error(f"Error loading LS_SKU: {str(e)}")
+            except Exception as e:
+                st.error(f"Error loading LS_SKU: {str(e)}")
 
 def show_step_2_database():
     """Step 2: Show database transformation"""
@@ -209,16 +438,12 @@ def show_step_2_database():
     with col3:
         st.markdown("### 📊 Database Health")
 
-        conn = sqlite3.connect('data/onelead.db')
-        tables = conn.execute("SELECT name FROM sqlite_master WHERE type='table'").fetchall()
-        conn.close()
-
-        st.metric("Total Tables", len(tables))
-        st.metric("Database Size", f"{Path('data/onelead.db').stat().st_size / 1024 / 1024:.1f} MB")
+        st.metric("Total Tables", len(stats['tables']))
+        st.metric("Database Size", f"{get_db_size_mb():.1f} MB")
 
         with st.expander("📋 View All Tables"):
-            for table in tables:
-                st.text(f"• {table[0]}")
+            for table in stats['tables']:
+                st.text(f"• {table}")
 
 def show_step_3_matching():
     """Step 3: Show product matching"""
@@ -229,7 +454,7 @@ def show_step_3_matching():
     st.markdown('<div class="step-desc">Install Base products are matched to LS_SKU categories using keyword matching</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-    conn = sqlite3.connect('data/onelead.db')
+    conn = get_db_connection()
 
     # Show matching details
     query = """
@@ -242,10 +467,16 @@ def show_step_3_matching():
     JOIN map_install_base_to_ls_sku m ON p.product_key = m.product_key
     JOIN dim_ls_sku_product ls ON m.ls_product_key = ls.ls_product_key
     ORDER BY m.confidence_score DESC
+    LIMIT 500
     """
 
-    df_matches = pd.read_sql_query(query, conn)
-    conn.close()
+    cursor = conn.execute(query)
+    df_matches = pd.DataFrame.from_records(
+        cursor.fetchall(),
+        columns=[col[0] for col in cursor.description]
+    )
+    # DECIMAL(5,2) scores fit comfortably in float32
+    df_matches['confidence_score'] = df_matches['confidence_score'].astype('float32')
 
     if not df_matches.empty:
         col1, col2 = st.columns([2, 1])
@@ -262,17 +493,12 @@ def show_step_3_matching():
         with col2:
             st.markdown("### 📊 Match Quality")
 
-            avg_confidence = df_matches['confidence_score'].mean()
+            total_matches, avg_confidence, buckets = get_match_stats()
             st.metric("Average Confidence", f"{avg_confidence:.0f}%")
-            st.metric("Total Matches", len(df_matches))
+            st.metric("Total Matches", total_matches)
 
-            # Confidence distribution
-            fig = px.histogram(
-                df_matches,
-                x='confidence_score',
-                title='Confidence Score Distribution',
-                labels={'confidence_score': 'Confidence Score', 'count': 'Count'}
-            )
+            # Confidence distribution, binned in SQL
+            fig = build_confidence_bar(tuple(buckets.itertuples(index=False, name=None)))
             st.plotly_chart(fig, use_container_width=True)
     else:
         st.warning("No product matches found. Please ensure data is loaded.")
@@ -286,10 +512,8 @@ def show_step_4_recommendations():
     st.markdown('<div class="step-desc">Services are recommended based on matched products, with urgency and SKU codes</div>', unsafe_allow_html=True)
     st.markdown('</div>', unsafe_allow_html=True)
 
-    engine = get_recommendation_engine()
-
     # Generate all recommendations
-    recs = engine.generate_quote_ready_export()
+    recs = load_recommendations(None, ())
 
     # Rename columns to match expected format
     if not recs.empty:
@@ -338,30 +562,14 @@ def show_step_4_recommendations():
             st.markdown("### 📊 Recommendations by Priority")
             if 'urgency' in recs.columns:
                 urgency_counts = recs['urgency'].value_counts()
-                fig = px.pie(
-                    values=urgency_counts.values,
-                    names=urgency_counts.index,
-                    title='Priority Distribution',
-                    color_discrete_map={
-                        'Critical': '#ff4b4b',
-                        'High': '#ffa500',
-                        'Medium': '#ffeb3b',
-                        'Low': '#4caf50'
-                    }
-                )
+                fig = build_priority_pie(tuple(urgency_counts.items()))
                 st.plotly_chart(fig, use_container_width=True)
 
         with col2:
             st.markdown("### 👥 Top Customers")
             if 'customer_name' in recs.columns:
                 customer_counts = recs['customer_name'].value_counts().head(5)
-                fig = px.bar(
-                    x=customer_counts.values,
-                    y=customer_counts.index,
-                    orientation='h',
-                    title='Recommendations per Customer',
-                    labels={'x': 'Recommendations', 'y': 'Customer'}
-                )
+                fig = build_top_customers_bar(tuple(customer_counts.items()))
                 st.plotly_chart(fig, use_container_width=True)
     else:
         st.warning("No recommendations generated. Please check data.")
@@ -382,7 +590,6 @@ def show_step_5_dashboard():
 
     with col1:
         # Customer filter
-        engine = get_recommendation_engine()
         data = load_database_data()
         customers = data.get('customers', pd.DataFrame())
 
@@ -407,17 +614,18 @@ def show_step_5_dashboard():
 
     # Generate filtered recommendations
     customer_id = None if selected_customer == 'All Customers' else selected_customer
-    recs = engine.generate_quote_ready_export(
-        customer_id=customer_id,
-        urgency_filter=urgency_options if urgency_options else None
-    )
+    if customer_id is None:
+        # Reuse the unfiltered set Step 4 already generated and filter urgency in pandas
+        recs = load_recommendations(None, ())
+        if urgency_options:
+            recs = recs.loc[recs['urgency'].isin(urgency_options)]
+    else:
+        recs = load_recommendations(customer_id, tuple(sorted(urgency_options)))
 
-    # Rename columns
+    # Rename columns; assign() returns a new frame rather than writing into the slice
     if not recs.empty:
-        if 'match_confidence' in recs.columns:
-            recs['confidence'] = recs['match_confidence']
-        if 'current_product' in recs.columns:
-            recs['product_name'] = recs['current_product']
+        renamed = {'confidence': 'match_confidence', 'product_name': 'current_product'}
+        recs = recs.assign(**{new: recs[old] for new, old in renamed.items() if old in recs.columns})
 
         # Apply confidence filter
         if 'confidence' in recs.columns:
@@ -438,6 +646,7 @@ def show_step_5_dashboard():
         st.markdown("---")
 
         # Prepare display data
+        recommendation_reasons = build_recommendation_reasons(recs)
         display_df = recs.copy()
 
         display_cols = ['customer_name', 'product_name', 'service_name', 'sku_codes', 'urgency', 'confidence']
@@ -445,12 +654,14 @@ def show_step_5_dashboard():
         display_df = display_df[display_cols]
 
         # Format data
-        if 'confidence' in display_df.columns:
-            display_df['confidence'] = display_df['confidence'].apply(lambda x: f"{int(x)}%" if pd.notna(x) else "N/A")
+        display_df['reasons'] = [
+            "\n".join(f"• {r}" for r in recommendation_reasons[key]) or "Standard service for this product type"
+            for key in display_df.index
+        ]
 
         if 'sku_codes' in display_df.columns:
-            display_df['sku_codes'] = display_df['sku_codes'].fillna('📞 Contact HPE')
-            display_df['sku_codes'] = display_df['sku_codes'].replace('', '📞 Contact HPE')
+            sku = display_df['sku_codes']
+            display_df['sku_codes'] = sku.where(sku.notna() & (sku != ''), '📞 Contact HPE')
 
         # Rename columns
         column_mapping = {
@@ -459,112 +670,42 @@ def show_step_5_dashboard():
             'service_name': 'Service Name',
             'sku_codes': 'SKU Code',
             'urgency': 'Priority',
-            'confidence': 'Confidence'
+            'confidence': 'Confidence',
+            'reasons': 'Why Recommended'
         }
         display_df = display_df.rename(columns=column_mapping)
 
+        column_config = {
+            'Why Recommended': st.column_config.TextColumn('Why Recommended', width='large'),
+            'Confidence': st.column_config.ProgressColumn(
+                'Confidence',
+                format='%d%%',
+                min_value=0,
+                max_value=100
+            )
+        }
+
         # Add urgency emoji
         if 'Priority' in display_df.columns:
-            display_df['Priority'] = display_df['Priority'].apply(lambda x:
-                f"🔴 {x}" if x == 'Critical' else
-                f"🟠 {x}" if x == 'High' else
-                f"🟡 {x}" if x == 'Medium' else
-                f"🟢 {x}" if x == 'Low' else x
-            )
+            display_df['Priority'] = display_df['Priority'].map(URGENCY_LABELS).fillna(display_df['Priority'])
 
-        # Show recommendations as expandable cards
+        # Show recommendations grouped by customer
         st.markdown(f"### 📋 Detailed Recommendations")
 
-        # Group by customer
         if 'Customer' in display_df.columns:
-            for customer in display_df['Customer'].unique():
-                customer_recs = display_df[display_df['Customer'] == customer]
-
-                # Get original data for this customer to add reasoning
-                orig_customer_recs = recs[recs['customer_name'] == customer].copy()
-
+            for customer, customer_recs in display_df.groupby('Customer', sort=False):
                 with st.expander(f"👤 {customer} ({len(customer_recs)} recommendations)", expanded=True):
-                    # Show each recommendation with explanation
-                    for idx, (_, rec) in enumerate(customer_recs.iterrows(), 1):
-                        # Get original data for reasoning
-                        orig_rec = orig_customer_recs.iloc[idx-1] if idx <= len(orig_customer_recs) else None
-
-                        # Create a card for each recommendation
-                        st.markdown(f"**{idx}. {rec['Service Name']}**")
-
-                        col1, col2 = st.columns([3, 1])
-
-                        with col1:
-                            # Recommendation details
-                            st.markdown(f"""
-                            - **Product**: {rec['Product']}
-                            - **SKU Code**: {rec['SKU Code']}
-                            - **Priority**: {rec['Priority']}
-                            - **Confidence**: {rec['Confidence']}
-                            """)
-
-                            # Build reasoning
-                            reasons = []
-
-                            # Product-based reasoning
-                            if orig_rec is not None:
-                                if 'product_platform' in orig_rec:
-                                    platform = orig_rec['product_platform']
-                                    if pd.notna(platform):
-                                        reasons.append(f"Product is in **{platform}** category")
-
-                                # Urgency reasoning
-                                urgency = rec['Priority'].split(' ')[-1]  # Remove emoji
-                                if urgency == 'Critical':
-                                    if 'support_status' in orig_rec and orig_rec['support_status'] == 'Expired':
-                                        reasons.append("⚠️ **Support has expired** - service renewal needed immediately")
-                                    elif 'days_to_eol' in orig_rec and pd.notna(orig_rec['days_to_eol']):
-                                        days = orig_rec['days_to_eol']
-                                        if days < 90:
-                                            reasons.append(f"⚠️ **Product EOL in {days} days** - urgent service required")
-                                elif urgency == 'High':
-                                    if 'days_to_eol' in orig_rec and pd.notna(orig_rec['days_to_eol']):
-                                        days = orig_rec['days_to_eol']
-                                        if days < 180:
-                                            reasons.append(f"⏰ **Product EOL in {days} days** - service recommended soon")
-                                elif urgency == 'Low':
-                                    reasons.append("✅ Product is healthy - proactive maintenance recommended")
-
-                                # Match confidence reasoning
-                                if 'match_confidence' in orig_rec:
-                                    conf = orig_rec['match_confidence']
-                                    if conf == 100:
-                                        reasons.append("🎯 **Exact product match** - highly relevant service")
-                                    elif conf >= 85:
-                                        reasons.append("✅ **Strong product match** - recommended by matching algorithm")
-                                    elif conf >= 70:
-                                        reasons.append("📊 **Category match** - service fits product type")
-
-                                # Service type reasoning
-                                service_name = rec['Service Name'].lower()
-                                if 'health check' in service_name:
-                                    reasons.append("🏥 Validates system health and identifies issues")
-                                elif 'upgrade' in service_name or 'firmware' in service_name:
-                                    reasons.append("⬆️ Keeps system up-to-date with latest features and security")
-                                elif 'install' in service_name or 'startup' in service_name:
-                                    reasons.append("🚀 Ensures proper setup and configuration")
-                                elif 'optimization' in service_name:
-                                    reasons.append("⚡ Improves performance and efficiency")
-                                elif 'migration' in service_name:
-                                    reasons.append("🔄 Facilitates smooth transition to new systems")
-
-                        with col2:
-                            # Show reasoning box
-                            if reasons:
-                                st.info("**Why Recommended:**\n\n" + "\n\n".join(f"• {r}" for r in reasons))
-                            else:
-                                st.info("**Why Recommended:**\n\nStandard service for this product type")
-
-                        st.markdown("---")
+                    st.dataframe(
+                        customer_recs.drop(columns='Customer'),
+                        column_config=column_config,
+                        use_container_width=True,
+                        hide_index=True
+                    )
         else:
             # Fallback: show all as one table
             st.dataframe(
                 display_df,
+                column_config=column_config,
                 use_container_width=True,
                 height=600,
                 hide_index=True
@@ -576,7 +717,7 @@ def show_step_5_dashboard():
             col1, col2 = st.columns(2)
 
             with col1:
-                csv = recs.to_csv(index=False)
+                csv = to_csv_bytes(recs)
                 st.download_button(
                     label="📥 Download All Recommendations",
                     data=csv,
@@ -589,7 +730,7 @@ def show_step_5_dashboard():
                 if 'sku_codes' in recs.columns:
                     quote_ready = recs[recs['sku_codes'].notna() & (recs['sku_codes'] != '')]
                     if not quote_ready.empty:
-                        csv_ready = quote_ready.to_csv(index=False)
+                        csv_ready = to_csv_bytes(quote_ready)
                         st.download_button(
                             label="📄 Download Quote-Ready Only",
                             data=csv_ready,
@@ -637,10 +778,8 @@ def main():
         st.caption(f"📅 {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
     with col3:
-        conn = sqlite3.connect('data/onelead.db')
-        cursor = conn.execute("SELECT COUNT(*) FROM dim_ls_sku_service")
+        cursor = get_db_connection().execute("SELECT COUNT(*) FROM dim_ls_sku_service")
         service_count = cursor.fetchone()[0]
-        conn.close()
         st.caption(f"📦 {service_count} services available")
 
 if __name__ == "__main__":
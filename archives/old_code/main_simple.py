@@ -5,8 +5,7 @@ Clear and actionable service recommendations
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import sqlite3
+import numpy as np
 from datetime import datetime
 
 # Import data loaders
@@ -66,9 +65,18 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)
+# Urgency emoji, and the priority labels built from them for the recommendations table
+URGENCY_EMOJI = {
+    'Critical': '🔴',
+    'High': '🟠',
+    'Medium': '🟡',
+    'Low': '🟢'
+}
+URGENCY_LABELS = {urgency: f"{emoji} {urgency}" for urgency, emoji in URGENCY_EMOJI.items()}
+PAGE_SIZE = 50
+
 def load_database_data():
-    """Load all data from SQLite database"""
+    """Load all data from SQLite database (cached by the loader, keyed on the file's mtime)"""
     loader = OneleadSQLiteLoader("data/onelead.db")
     return loader.load_all_data()
 
@@ -77,6 +85,53 @@ def get_recommendation_engine():
     """Get cached recommendation engine instance"""
     return EnhancedRecommendationEngine('data/onelead.db')
 
+@st.cache_data(ttl=3600)
+def get_customer_list():
+    """Get the sorted customer selectbox options"""
+    customers = load_database_data().get('customers', pd.DataFrame())
+    if customers.empty or 'customer_name' not in customers.columns:
+        return ['All Customers']
+    names = np.unique(customers['customer_name'].dropna().to_numpy())
+    return ['All Customers', *names.tolist()]
+
+@st.cache_data(ttl=600, show_spinner=False)
+def load_recommendations(customer_id=None, urgency_filter=(), min_confidence=None):
+    """Generate quote-ready recommendations, memoized per filter combination"""
+    recs = get_recommendation_engine().generate_quote_ready_export(
+        customer_id=customer_id,
+        urgency_filter=list(urgency_filter) if urgency_filter else None,
+        min_confidence=min_confidence
+    )
+    # Low-cardinality labels repeat on every row; store them as categories
+    for col in ('urgency', 'customer_name'):
+        if col in recs.columns:
+            recs[col] = recs[col].astype('category')
+    return recs
+
+@st.cache_resource
+def get_db_connection():
+    """Get cached read-only SQLite connection shared across reruns"""
+    import sqlite3
+
+    conn = sqlite3.connect('file:data/onelead.db?mode=ro', uri=True, check_same_thread=False)
+    conn.execute("PRAGMA mmap_size=268435456")
+    conn.execute("PRAGMA query_only=1")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-65536")
+    return conn
+
+@st.cache_data(ttl=600)
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV bytes for download buttons"""
+    return df.to_csv(index=False).encode('utf-8')
+
+@st.cache_data(ttl=3600)
+def get_service_count():
+    """Get the number of services in the LS_SKU catalog"""
+    # The catalog is append-only (bulk loaded, never deleted from), so the
+    # highest rowid equals the row count and is read straight off the B-tree
+    return get_db_connection().execute("SELECT MAX(rowid) FROM dim_ls_sku_service").fetchone()[0] or 0
+
 def main():
     # Sidebar for filters
     with st.sidebar:
@@ -85,48 +140,38 @@ def main():
 
         st.header("Filter Options")
 
-        # Customer filter
-        engine = get_recommendation_engine()
-        data = load_database_data()
+        # Filters only take effect on submit, so dragging the slider does not rerun the query
+        with st.form("filters"):
+            # Customer filter
+            customer_list = get_customer_list()
 
-        customers = data.get('customers', pd.DataFrame())
-        if not customers.empty and 'customer_name' in customers.columns:
-            customer_list = ['All Customers'] + sorted(customers['customer_name'].unique().tolist())
-        else:
-            customer_list = ['All Customers']
-
-        selected_customer = st.selectbox(
-            "Select Customer",
-            options=customer_list,
-            help="Choose a specific customer or view all"
-        )
-
-        # Urgency filter
-        st.markdown("**Urgency Level**")
-        show_critical = st.checkbox("Critical", value=True, help="Expired or urgent items")
-        show_high = st.checkbox("High", value=True, help="Needs attention soon")
-        show_medium = st.checkbox("Medium", value=False, help="Plan ahead")
-        show_low = st.checkbox("Low", value=False, help="Future consideration")
-
-        urgency_filter = []
-        if show_critical:
-            urgency_filter.append('Critical')
-        if show_high:
-            urgency_filter.append('High')
-        if show_medium:
-            urgency_filter.append('Medium')
-        if show_low:
-            urgency_filter.append('Low')
-
-        # Confidence filter
-        min_confidence = st.slider(
-            "Minimum Confidence",
-            min_value=50,
-            max_value=100,
-            value=60,
-            step=5,
-            help="Only show recommendations we're confident about"
-        )
+            selected_customer = st.selectbox(
+                "Select Customer",
+                options=customer_list,
+                help="Choose a specific customer or view all"
+            )
+
+            # Urgency filter
+            st.markdown("**Urgency Level**")
+            show_critical = st.checkbox("Critical", value=True, help="Expired or urgent items")
+            show_high = st.checkbox("High", value=True, help="Needs attention soon")
+            show_medium = st.checkbox("Medium", value=False, help="Plan ahead")
+            show_low = st.checkbox("Low", value=False, help="Future consideration")
+
+            urgency_flags = {'Critical': show_critical, 'High': show_high, 'Medium': show_medium, 'Low': show_low}
+            urgency_filter = tuple(level for level, selected in urgency_flags.items() if selected)
+
+            # Confidence filter
+            min_confidence = st.slider(
+                "Minimum Confidence",
+                min_value=50,
+                max_value=100,
+                value=60,
+                step=5,
+                help="Only show recommendations we're confident about"
+            )
+
+            st.form_submit_button("Apply Filters", use_container_width=True, type="primary")
 
         st.markdown("---")
         st.markdown("### About")
@@ -139,32 +184,28 @@ def main():
     # Get recommendations based on filters
     try:
         customer_id = None if selected_customer == 'All Customers' else selected_customer
-        recs = engine.generate_quote_ready_export(
-            customer_id=customer_id,
-            urgency_filter=urgency_filter if urgency_filter else None
-        )
-
-        # Apply confidence filter
-        if not recs.empty and 'confidence' in recs.columns:
-            recs = recs[recs['confidence'] >= min_confidence]
+        recs = load_recommendations(customer_id, tuple(sorted(urgency_filter)), min_confidence)
 
         if not recs.empty:
-            # Summary metrics
+            # Summary metrics; the SKU mask is shared with the table and the quote-ready download
+            sku_mask = recs['sku_codes'].fillna('').ne('') if 'sku_codes' in recs.columns else None
+            has_sku = int(sku_mask.sum()) if sku_mask is not None else 0
+            customers_count = recs['customer_name'].nunique() if 'customer_name' in recs.columns else 0
+            mean_conf = recs['match_confidence'].mean()
+            avg_conf = int(mean_conf) if pd.notna(mean_conf) else 0
+
             col1, col2, col3, col4 = st.columns(4)
 
             with col1:
                 st.metric("📋 Recommendations", len(recs))
 
             with col2:
-                has_sku = (recs['sku_codes'].notna() & (recs['sku_codes'] != '')).sum() if 'sku_codes' in recs.columns else 0
                 st.metric("✅ With SKU Code", has_sku)
 
             with col3:
-                customers_count = recs['customer_name'].nunique() if 'customer_name' in recs.columns else 0
                 st.metric("👥 Customers", customers_count)
 
             with col4:
-                avg_conf = int(recs['confidence'].mean()) if 'confidence' in recs.columns else 0
                 st.metric("📊 Avg Confidence", f"{avg_conf}%")
 
             st.markdown("---")
@@ -172,47 +213,42 @@ def main():
             # Main table
             st.subheader("📋 Recommendations")
 
-            # Prepare display data
-            display_df = recs.copy()
-
-            # Select and rename columns
+            # Build the display frame from only the shown columns, already renamed
             column_mapping = {
                 'customer_name': 'Customer',
-                'product_name': 'Product',
+                'current_product': 'Product',
                 'service_name': 'Service Name',
                 'sku_codes': 'SKU Code',
                 'urgency': 'Priority',
-                'confidence': 'Confidence'
+                'match_confidence': 'Confidence'
             }
 
-            display_cols = [col for col in column_mapping.keys() if col in display_df.columns]
-            display_df = display_df[display_cols]
+            # Only the current page is formatted and sent to the browser
+            page_count = (len(recs) - 1) // PAGE_SIZE + 1
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+            st.caption(f"Page {page} of {page_count} · {PAGE_SIZE} rows per page")
+            page_recs = recs.iloc[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
 
-            # Format data
-            if 'confidence' in display_df.columns:
-                display_df['confidence'] = display_df['confidence'].apply(lambda x: f"{int(x)}%" if pd.notna(x) else "N/A")
+            display_df = pd.DataFrame({
+                label: page_recs[col] for col, label in column_mapping.items() if col in page_recs.columns
+            })
 
-            if 'sku_codes' in display_df.columns:
-                display_df['sku_codes'] = display_df['sku_codes'].fillna('📞 Contact HPE')
-                display_df['sku_codes'] = display_df['sku_codes'].replace('', '📞 Contact HPE')
+            # Format data
+            if 'Confidence' in display_df.columns:
+                confidence = np.trunc(display_df['Confidence']).astype('Int64')
+                display_df['Confidence'] = confidence.astype(str).add('%').where(confidence.notna(), 'N/A')
 
-            # Rename columns
-            display_df = display_df.rename(columns=column_mapping)
+            if 'SKU Code' in display_df.columns:
+                display_df['SKU Code'] = display_df['SKU Code'].where(sku_mask, '📞 Contact HPE')
 
-            # Add urgency emoji
+            # Add urgency emoji by relabelling the categories; the codes are untouched
             if 'Priority' in display_df.columns:
-                display_df['Priority'] = display_df['Priority'].apply(lambda x:
-                    f"🔴 {x}" if x == 'Critical' else
-                    f"🟠 {x}" if x == 'High' else
-                    f"🟡 {x}" if x == 'Medium' else
-                    f"🟢 {x}" if x == 'Low' else x
-                )
+                display_df['Priority'] = display_df['Priority'].cat.rename_categories(URGENCY_LABELS)
 
             # Show table
             st.dataframe(
                 display_df,
                 use_container_width=True,
-                height=500,
                 hide_index=True
             )
 
@@ -221,7 +257,7 @@ def main():
             col1, col2, col3 = st.columns([1, 1, 2])
 
             with col1:
-                csv = recs.to_csv(index=False)
+                csv = to_csv_bytes(recs)
                 st.download_button(
                     label="📥 Download All Recommendations",
                     data=csv,
@@ -231,10 +267,10 @@ def main():
 
             with col2:
                 # Quote-ready only (has SKU code)
-                if 'sku_codes' in recs.columns:
-                    quote_ready = recs[recs['sku_codes'].notna() & (recs['sku_codes'] != '')]
+                if sku_mask is not None:
+                    quote_ready = recs[sku_mask]
                     if not quote_ready.empty:
-                        csv_ready = quote_ready.to_csv(index=False)
+                        csv_ready = to_csv_bytes(quote_ready)
                         st.download_button(
                             label="📄 Download Quote-Ready Only",
                             data=csv_ready,
@@ -252,18 +288,20 @@ def main():
                 if 'urgency' in recs.columns:
                     st.markdown("**Recommendations by Priority**")
                     urgency_counts = recs['urgency'].value_counts()
+                    levels = urgency_counts.index.astype(str)
+                    emoji = levels.map(URGENCY_EMOJI).fillna("🟢")
 
-                    for urgency, count in urgency_counts.items():
-                        emoji = "🔴" if urgency == "Critical" else "🟠" if urgency == "High" else "🟡" if urgency == "Medium" else "🟢"
-                        st.markdown(f"{emoji} **{urgency}**: {count} recommendations")
+                    lines = emoji + " **" + levels + "**: " + urgency_counts.astype(str).to_numpy() + " recommendations"
+                    st.markdown("\n\n".join(lines))
 
             with col2:
                 if 'customer_name' in recs.columns:
                     st.markdown("**Top Customers**")
+                    # Counted from the cached recs already on screen; no second query
                     customer_counts = recs['customer_name'].value_counts().head(5)
 
-                    for customer, count in customer_counts.items():
-                        st.markdown(f"👤 **{customer}**: {count} recommendations")
+                    lines = "👤 **" + customer_counts.index.astype(str) + "**: " + customer_counts.astype(str).to_numpy() + " recommendations"
+                    st.markdown("\n\n".join(lines))
 
         else:
             st.warning("📭 No recommendations match your current filters.")
@@ -300,10 +338,7 @@ def main():
         st.caption(f"📅 Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
 
     with col3:
-        conn = sqlite3.connect('data/onelead.db')
-        cursor = conn.execute("SELECT COUNT(*) FROM dim_ls_sku_service")
-        service_count = cursor.fetchone()[0]
-        conn.close()
+        service_count = get_service_count()
         st.caption(f"📦 {service_count} services in catalog")
 
 if __name__ == "__main__":
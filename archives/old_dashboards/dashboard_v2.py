@@ -198,6 +198,16 @@ def get_priority_color(priority):
     }
     return colors.get(priority, '#6c757d')
 
+def add_priority_band(levels):
+    """Prefix priority/risk levels with a colored emoji band."""
+    bands = {
+        'CRITICAL': '🔴 CRITICAL',
+        'HIGH': '🟠 HIGH',
+        'MEDIUM': '🟡 MEDIUM',
+        'LOW': '🟢 LOW'
+    }
+    return levels.map(bands).fillna(levels)
+
 def render_priority_badge(priority):
     """Render a colored priority badge."""
     color = get_priority_color(priority)
@@ -553,17 +563,10 @@ elif page == "📋 Lead Queue":
         df = pd.DataFrame(lead_data)
 
         # Color code the dataframe
-        def highlight_priority(row):
-            colors = {
-                'CRITICAL': 'background-color: #ffe6e6',
-                'HIGH': 'background-color: #fff4e6',
-                'MEDIUM': 'background-color: #ffffcc',
-                'LOW': 'background-color: #e6ffe6'
-            }
-            return [colors.get(row['Priority'], '')] * len(row)
+        df['Priority'] = add_priority_band(df['Priority'])
 
         st.dataframe(
-            df.style.apply(highlight_priority, axis=1),
+            df,
             use_container_width=True,
             hide_index=True,
             height=600
@@ -669,17 +672,10 @@ elif page == "👤 Account 360°":
                     df = pd.DataFrame(ib_data)
 
                     # Color code by risk
-                    def highlight_risk(row):
-                        colors = {
-                            'CRITICAL': 'background-color: #ffe6e6',
-                            'HIGH': 'background-color: #fff4e6',
-                            'MEDIUM': 'background-color: #ffffcc',
-                            'LOW': 'background-color: #e6ffe6'
-                        }
-                        return [colors.get(row['Risk'], '')] * len(row)
+                    df['Risk'] = add_priority_band(df['Risk'])
 
                     st.dataframe(
-                        df.style.apply(highlight_risk, axis=1),
+                        df,
                         use_container_width=True,
                         hide_index=True
                     )
@@ -886,18 +882,10 @@ elif page == "🗺️ Territory View":
                     })
 
                 df = pd.DataFrame(lead_data)
-
-                def highlight_priority(row):
-                    colors = {
-                        'CRITICAL': 'background-color: #ffe6e6',
-                        'HIGH': 'background-color: #fff4e6',
-                        'MEDIUM': 'background-color: #ffffcc',
-                        'LOW': 'background-color: #e6ffe6'
-                    }
-                    return [colors.get(row['Priority'], '')] * len(row)
+                df['Priority'] = add_priority_band(df['Priority'])
 
                 st.dataframe(
-                    df.style.apply(highlight_priority, axis=1),
+                    df,
                     use_container_width=True,
                     hide_index=True,
                     height=500
@@ -2,6 +2,7 @@
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from sqlalchemy import func, case, desc
@@ -556,6 +557,12 @@ def load_dashboard_data():
         session.close()
 
 
+@st.cache_data
+def to_csv_bytes(df):
+    """Serialize a DataFrame to CSV bytes for download buttons."""
+    return df.to_csv(index=False).encode('utf-8')
+
+
 def render_header(stats):
     """Render premium header."""
     st.markdown(f"""
@@ -927,12 +934,13 @@ def render_lead_priorities(leads_df):
             key="sort_filter"
         )
 
-    # Apply filters
-    filtered_df = leads_df.copy()
+    # Apply filters as one fused mask so the frame is sliced once
+    mask = np.ones(len(leads_df), dtype=bool)
     if priority_filter != "All":
-        filtered_df = filtered_df[filtered_df['priority'] == priority_filter]
+        mask &= leads_df['priority'].to_numpy() == priority_filter
     if type_filter != "All":
-        filtered_df = filtered_df[filtered_df['lead_type'] == type_filter]
+        mask &= leads_df['lead_type'].to_numpy() == type_filter
+    filtered_df = leads_df[mask]
 
     # Apply sorting
     if sort_by == "Score (High to Low)":
@@ -941,8 +949,9 @@ def render_lead_priorities(leads_df):
         filtered_df = filtered_df.sort_values('estimated_value', ascending=False)
     else:
         priority_order = {'CRITICAL': 0, 'HIGH': 1, 'MEDIUM': 2, 'LOW': 3}
-        filtered_df['priority_rank'] = filtered_df['priority'].map(priority_order)
-        filtered_df = filtered_df.sort_values(['priority_rank', 'score'], ascending=[True, False])
+        filtered_df = filtered_df.assign(
+            priority_rank=filtered_df['priority'].map(priority_order)
+        ).sort_values(['priority_rank', 'score'], ascending=[True, False])
 
     # Display leads
     col_info, col_export = st.columns([3, 1])
@@ -950,7 +959,7 @@ def render_lead_priorities(leads_df):
         st.markdown(f"<p style='color: #64748b; margin: 1rem 0;'>Showing {len(filtered_df)} of {len(leads_df)} leads</p>", unsafe_allow_html=True)
     with col_export:
         # Export to CSV button
-        csv_data = filtered_df.to_csv(index=False)
+        csv_data = to_csv_bytes(filtered_df)
         st.download_button(
             label="📥 Download CSV",
             data=csv_data,
@@ -1363,8 +1372,9 @@ def render_analytics(leads_df):
     st.markdown('</div>', unsafe_allow_html=True)
 
     # Calculate quality metrics
-    high_quality = len(leads_df[leads_df['score'] >= 75])
-    medium_quality = len(leads_df[(leads_df['score'] >= 60) & (leads_df['score'] < 75)])
+    scores = leads_df['score'].to_numpy()
+    high_quality = int((scores >= 75).sum())
+    medium_quality = int(((scores >= 60) & (scores < 75)).sum())
     avg_score = leads_df['score'].mean()
 
     st.markdown(f"""
@@ -175,6 +175,12 @@ def load_summary_stats():
     return stats
 
 
+@st.cache_data(ttl=300)
+def get_filter_options(values: pd.Series):
+    """Get sorted selectbox options for a filter column."""
+    return ['All'] + sorted(values.dropna().unique().tolist())
+
+
 def render_header():
     """Render application header."""
     st.markdown('<div class="main-header">🎯 OneLead</div>', unsafe_allow_html=True)
@@ -341,11 +347,11 @@ def render_priority_filter(df_leads):
     st.sidebar.markdown("### 🎯 Filters")
 
     # Priority filter
-    priorities = ['All'] + sorted(df_leads['priority'].unique().tolist())
+    priorities = get_filter_options(df_leads['priority'])
     selected_priority = st.sidebar.selectbox("Priority", priorities)
 
     # Lead type filter
-    lead_types = ['All'] + sorted(df_leads['lead_type'].unique().tolist())
+    lead_types = get_filter_options(df_leads['lead_type'])
     selected_type = st.sidebar.selectbox("Lead Type", lead_types)
 
     # Score range filter
@@ -358,21 +364,16 @@ def render_priority_filter(df_leads):
         (min_score, max_score)
     )
 
-    # Apply filters
-    filtered_df = df_leads.copy()
+    # Apply filters as one fused mask so the frame is sliced once
+    mask = df_leads['score'].between(score_range[0], score_range[1]).to_numpy()
 
     if selected_priority != 'All':
-        filtered_df = filtered_df[filtered_df['priority'] == selected_priority]
+        mask &= df_leads['priority'].to_numpy() == selected_priority
 
     if selected_type != 'All':
-        filtered_df = filtered_df[filtered_df['lead_type'] == selected_type]
-
-    filtered_df = filtered_df[
-        (filtered_df['score'] >= score_range[0]) &
-        (filtered_df['score'] <= score_range[1])
-    ]
+        mask &= df_leads['lead_type'].to_numpy() == selected_type
 
-    return filtered_df
+    return df_leads[mask]
 
 
 def get_priority_badge(priority):